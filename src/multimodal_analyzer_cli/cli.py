@@ -2,13 +2,9 @@ import asyncio
 from pathlib import Path
 
 import click
-import litellm
 from loguru import logger
 
-from .audio_analyzer import AudioAnalyzer
 from .config import Config
-from .image_analyzer import ImageAnalyzer
-from .video_analyzer import VideoAnalyzer
 
 
 def normalize_path(path_str: str) -> str:
@@ -201,6 +197,8 @@ def main(
 
     # Enable LiteLLM verbose logging for DEBUG level
     if log_level == "DEBUG":
+        import litellm
+
         litellm.set_verbose = True
 
     # Load configuration
@@ -216,6 +214,8 @@ def main(
     if input_format == "stream-json":
         # Handle streaming mode
         if type_ == "image":
+            from .image_analyzer import ImageAnalyzer
+
             analyzer = ImageAnalyzer(config, system)
             try:
                 asyncio.run(
@@ -239,6 +239,8 @@ def main(
 
     # Create appropriate analyzer for regular (non-streaming) mode
     if type_ == "image":
+        from .image_analyzer import ImageAnalyzer
+
         analyzer = ImageAnalyzer(config, system)
 
         # Run image analysis
@@ -266,6 +268,8 @@ def main(
             raise click.ClickException(str(e))
 
     elif type_ == "audio":
+        from .audio_analyzer import AudioAnalyzer
+
         analyzer = AudioAnalyzer(config, system)
 
         # Run audio analysis
@@ -294,6 +298,8 @@ def main(
             raise click.ClickException(str(e))
 
     elif type_ == "video":
+        from .video_analyzer import VideoAnalyzer
+
         analyzer = VideoAnalyzer(config, system)
 
         # Run video analysis
@@ -1,3 +1,4 @@
+import functools
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -8,7 +9,26 @@ from dotenv import load_dotenv
 from .auth import GoogleAuthProvider
 
 
-@dataclass
+# Config fields loaded from environment variables, as field name -> variable
+_ENV_FIELDS = {
+    "openai_api_key": "OPENAI_API_KEY",
+    "anthropic_api_key": "ANTHROPIC_API_KEY",
+    "gemini_api_key": "GEMINI_API_KEY",
+    "AZURE_OPENAI_API_KEY": "AZURE_OPENAI_API_KEY",
+    "azure_openai_endpoint": "AZURE_OPENAI_ENDPOINT",
+}
+
+# Additional variables read by GoogleAuthProvider.from_environment
+_AUTH_ENV_VARS = ("OAUTH_CALLBACK_HOST", "OAUTH_CALLBACK_PORT")
+
+
+@functools.cache
+def _load_env_file() -> None:
+    """Load the .env file into the process environment once per process."""
+    load_dotenv()
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
     """Configuration management for Media Analyzer CLI."""
 
@@ -19,8 +39,8 @@ class Config:
     AZURE_OPENAI_API_KEY: str | None = None
     azure_openai_endpoint: str | None = None
 
-    # Google authentication provider
-    google_auth_provider: GoogleAuthProvider | None = field(default=None, init=False)
+    # Google authentication provider (set by load())
+    _google_auth_provider: GoogleAuthProvider | None = field(default=None, repr=False)
 
     # Default settings
     default_model: str = "gemini/gemini-2.5-flash"
@@ -30,16 +50,14 @@ class Config:
     max_file_size_mb: int = 10
 
     # Supported formats
-    supported_image_formats: list = field(
-        default_factory=lambda: [
-            ".jpg",
-            ".jpeg",
-            ".png",
-            ".gif",
-            ".bmp",
-            ".tiff",
-            ".webp",
-        ]
+    supported_image_formats: tuple[str, ...] = (
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".bmp",
+        ".tiff",
+        ".webp",
     )
 
     # Advanced settings
@@ -49,26 +67,38 @@ class Config:
     max_video_size_mb: int = 2048  # 2GB default for Gemini 2.0
 
     # Video specific settings
-    supported_video_formats: list = field(
-        default_factory=lambda: [
-            ".mp4",
-            ".avi",
-            ".mov",
-            ".mkv",
-            ".wmv",
-            ".flv",
-            ".webm",
-            ".m4v"
-        ]
+    supported_video_formats: tuple[str, ...] = (
+        ".mp4",
+        ".avi",
+        ".mov",
+        ".mkv",
+        ".wmv",
+        ".flv",
+        ".webm",
+        ".m4v",
     )
 
     @classmethod
     def load(cls, config_file: Path | None = None) -> "Config":
-        """Load configuration from environment and optional YAML file."""
+        """Load configuration from environment and optional YAML file.
+
+        The result is cached per (config file, relevant environment values);
+        use dataclasses.replace() to derive a modified copy.
+        """
 
         # Load environment variables (only for .env file support)
-        load_dotenv()
+        _load_env_file()
+
+        env_vars = (*_ENV_FIELDS.values(), *_AUTH_ENV_VARS)
+        env = tuple((name, os.getenv(name)) for name in env_vars)
+        return cls._load_cached(config_file, env)
 
+    @classmethod
+    @functools.lru_cache(maxsize=8)
+    def _load_cached(
+        cls, config_file: Path | None, env: tuple[tuple[str, str | None], ...]
+    ) -> "Config":
+        """Build a Config from the YAML file and the (name, value) env pairs."""
         # Start with default config
         config_data = {}
 
@@ -77,22 +107,26 @@ class Config:
             with open(config_file) as f:
                 config_data = yaml.safe_load(f) or {}
 
+        # Keep format lists immutable since the instance is shared
+        for key in ("supported_image_formats", "supported_video_formats"):
+            if key in config_data:
+                config_data[key] = tuple(config_data[key])
+
         # Load only essential API keys from environment
+        env_values = dict(env)
         config_data.update({
-            "openai_api_key": os.getenv("OPENAI_API_KEY"),
-            "anthropic_api_key": os.getenv("ANTHROPIC_API_KEY"),
-            "gemini_api_key": os.getenv("GEMINI_API_KEY"),
-            "AZURE_OPENAI_API_KEY": os.getenv("AZURE_OPENAI_API_KEY"),
-            "azure_openai_endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
+            field_name: env_values[var] for field_name, var in _ENV_FIELDS.items()
         })
 
-        # Create config instance
-        config = cls(**config_data)
-        
-        # Initialize Google Auth Provider after config creation
-        config.google_auth_provider = GoogleAuthProvider.from_environment()
-        
-        return config
+        # Initialize Google Auth Provider from the same environment
+        config_data["_google_auth_provider"] = GoogleAuthProvider.from_environment()
+
+        return cls(**config_data)
+
+    @property
+    def google_auth_provider(self) -> GoogleAuthProvider | None:
+        """Google authentication provider, available on configs from load()."""
+        return self._google_auth_provider
 
     def get_api_key(self, model: str) -> str | None:
         """Get appropriate API key or OAuth token for the given model."""
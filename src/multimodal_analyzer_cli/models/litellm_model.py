@@ -57,7 +57,8 @@ class SystemPromptLoader:
         
         return content
 
-litellm.cache = Cache(type="disk", cache_dir="./.litellm_cache")
+# Resolve once so later chdirs (e.g. tests in temp dirs) keep hitting the same cache
+litellm.cache = Cache(type="disk", cache_dir=str(Path(".litellm_cache").resolve()))
 litellm.drop_params = True # drop unsupported OpenAI params automatically
 
 
@@ -1,5 +1,6 @@
 """Audio processing utilities for the media analyzer."""
 
+import functools
 import os
 import tempfile
 from pathlib import Path
@@ -9,10 +10,12 @@ from loguru import logger
 from pydub import AudioSegment
 
 # Supported audio formats
-AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".flac", ".ogg", ".aac", ".wma"}
+AUDIO_EXTENSIONS = frozenset({".mp3", ".wav", ".m4a", ".flac", ".ogg", ".aac", ".wma"})
 
 # Supported video formats (for audio extraction)
-VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".wmv", ".flv", ".webm", ".m4v"}
+VIDEO_EXTENSIONS = frozenset({
+    ".mp4", ".avi", ".mov", ".mkv", ".wmv", ".flv", ".webm", ".m4v"
+})
 
 
 def is_audio_file(file_path: Path) -> bool:
@@ -27,7 +30,8 @@ def is_video_file(file_path: Path) -> bool:
 
 def is_media_file(file_path: Path) -> bool:
     """Check if file is a supported media format (audio or video)."""
-    return is_audio_file(file_path) or is_video_file(file_path)
+    suffix = file_path.suffix.lower()
+    return suffix in AUDIO_EXTENSIONS or suffix in VIDEO_EXTENSIONS
 
 
 def get_media_files(directory: Path, recursive: bool = False) -> list[Path]:
@@ -89,23 +93,19 @@ def get_audio_info(audio_path: Path) -> dict:
     """
     Get information about audio file.
     
+    Successful results are cached per (path, mtime, size), so repeated calls
+    on an unchanged file skip decoding it again. Failures are not cached.
+    
     Args:
         audio_path: Path to audio file
         
     Returns:
         Dictionary with audio information
     """
+    stat = audio_path.stat()
     try:
-        audio = AudioSegment.from_file(str(audio_path))
-        
-        return {
-            "duration_seconds": len(audio) / 1000.0,
-            "duration_minutes": len(audio) / 60000.0,
-            "sample_rate": audio.frame_rate,
-            "channels": audio.channels,
-            "file_size_bytes": audio_path.stat().st_size,
-            "format": audio_path.suffix.lower().lstrip(".")
-        }
+        info = _get_audio_info_cached(str(audio_path), stat.st_mtime_ns, stat.st_size)
+        return dict(info)
     except Exception as e:
         logger.error(f"Error getting audio info for {audio_path}: {e}")
         return {
@@ -113,12 +113,30 @@ def get_audio_info(audio_path: Path) -> dict:
             "duration_minutes": 0,
             "sample_rate": 0,
             "channels": 0,
-            "file_size_bytes": audio_path.stat().st_size,
+            "file_size_bytes": stat.st_size,
             "format": audio_path.suffix.lower().lstrip("."),
             "error": str(e)
         }
 
 
+@functools.lru_cache(maxsize=256)
+def _get_audio_info_cached(path_str: str, mtime_ns: int, size: int) -> dict:
+    """Decode audio file and collect its information (cached by get_audio_info).
+
+    Decoding errors propagate, so lru_cache only ever stores successful results.
+    """
+    audio = AudioSegment.from_file(path_str)
+    
+    return {
+        "duration_seconds": len(audio) / 1000.0,
+        "duration_minutes": len(audio) / 60000.0,
+        "sample_rate": audio.frame_rate,
+        "channels": audio.channels,
+        "file_size_bytes": size,
+        "format": Path(path_str).suffix.lower().lstrip(".")
+    }
+
+
 def prepare_audio_for_transcription(file_path: Path) -> tuple[Path, bool]:
     """
     Prepare audio file for transcription.
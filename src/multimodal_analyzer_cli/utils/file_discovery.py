@@ -7,7 +7,9 @@ from .audio import AUDIO_EXTENSIONS, VIDEO_EXTENSIONS, is_audio_file, is_video_f
 from .video import SUPPORTED_VIDEO_FORMATS
 
 # Image format extensions
-IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"}
+IMAGE_EXTENSIONS = frozenset({
+    ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp"
+})
 
 # Media type mappings
 MEDIA_TYPE_EXTENSIONS = {
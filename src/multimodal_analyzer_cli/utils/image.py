@@ -1,4 +1,4 @@
-from collections.abc import Generator
+from collections.abc import Generator, Sequence
 from pathlib import Path
 
 from loguru import logger
@@ -8,7 +8,7 @@ from PIL import Image
 def find_images(
     path: Path, 
     recursive: bool = False, 
-    supported_formats: list[str] = None
+    supported_formats: Sequence[str] | None = None
 ) -> Generator[Path, None, None]:
     """Find all image files in the given path."""
     
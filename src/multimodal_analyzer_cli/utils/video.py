@@ -7,15 +7,15 @@ from typing import Any
 import ffmpeg
 from loguru import logger
 
-SUPPORTED_VIDEO_FORMATS = {
+SUPPORTED_VIDEO_FORMATS = frozenset({
     ".mp4", ".avi", ".mov", ".mkv", ".wmv", ".flv", ".webm", ".m4v"
-}
+})
 
 
 def find_videos(
     path: Path, 
     recursive: bool = False, 
-    supported_formats: set[str] | None = None
+    supported_formats: frozenset[str] | set[str] | None = None
 ) -> Generator[Path, None, None]:
     """Find all video files in the given path."""
     
@@ -0,0 +1,135 @@
+"""Shared pytest fixtures for media analyzer tests."""
+
+import functools
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from multimodal_analyzer_cli.cli import main
+from multimodal_analyzer_cli.config import Config
+from multimodal_analyzer_cli.image_analyzer import ImageAnalyzer
+from multimodal_analyzer_cli.models.litellm_model import LiteLLMModel
+from multimodal_analyzer_cli.video_analyzer import VideoAnalyzer
+
+from .test_utils import (
+    FAKE_VIDEO_BYTES,
+    create_test_audio,
+    get_primary_image_model,
+    get_primary_video_model,
+    get_test_audio_path,
+    get_test_image_path,
+    write_test_image,
+)
+
+
+@pytest.fixture(scope="session")
+def audio_path(tmp_path_factory) -> Path:
+    """Real test audio file if present, else a synthetic WAV shared by the session."""
+    test_audio_path = get_test_audio_path()
+    if test_audio_path.exists():
+        return test_audio_path
+    return create_test_audio(
+        tmp_path_factory.mktemp("audio") / "tone.wav", duration=5.0
+    )
+
+
+@pytest.fixture(scope="session")
+def image_path(shared_image) -> Path:
+    """Real test image if present, otherwise a synthetic JPEG shared by the session."""
+    test_image_path = get_test_image_path()
+    if test_image_path.exists():
+        return test_image_path
+    return shared_image()
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """CLI runner shared by the whole session."""
+    return CliRunner()
+
+
+@pytest.fixture
+def chdir_tmp_path(tmp_path, monkeypatch) -> Path:
+    """Run the test with a fresh temporary directory as working directory."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def config() -> Config:
+    """Configuration loaded once per session."""
+    return Config.load()
+
+
+@pytest.fixture(scope="session")
+def litellm_model(config) -> LiteLLMModel:
+    """LiteLLMModel shared by the session."""
+    return LiteLLMModel(config)
+
+
+@pytest.fixture(scope="session")
+def image_analyzer(config) -> ImageAnalyzer:
+    """ImageAnalyzer shared by the session."""
+    return ImageAnalyzer(config)
+
+
+@pytest.fixture(scope="session")
+def video_analyzer(config) -> VideoAnalyzer:
+    """VideoAnalyzer shared by the session."""
+    return VideoAnalyzer(config)
+
+
+@pytest.fixture(scope="session")
+def image_api_keys(config, primary_image_model) -> None:
+    """Validate the primary image model's API keys once per session."""
+    config.validate_api_keys(primary_image_model)
+
+
+@pytest.fixture(scope="session")
+def shared_image(tmp_path_factory):
+    """Read-only JPEG per (width, height, color), written once per session."""
+    image_dir = tmp_path_factory.mktemp("images")
+
+    @functools.cache
+    def make(width: int = 100, height: int = 100, color: str = "red") -> Path:
+        path = image_dir / f"{color}_{width}x{height}.jpg"
+        return write_test_image(path, width=width, height=height, color=color)
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def fake_video_file(tmp_path_factory) -> Path:
+    """Read-only .mp4 file with placeholder content, written once per session."""
+    path = tmp_path_factory.mktemp("fake_video") / "video.mp4"
+    path.write_bytes(FAKE_VIDEO_BYTES)
+    return path
+
+
+@pytest.fixture
+def fake_video_dir(tmp_path) -> Path:
+    """Directory holding two empty video files and one non-video file."""
+    video_dir = tmp_path / "videos"
+    video_dir.mkdir()
+    for name in ("video1.mp4", "video2.avi", "not_video.txt"):
+        (video_dir / name).touch()
+    return video_dir
+
+
+@pytest.fixture(scope="session")
+def help_result(runner):
+    """Result of invoking the CLI with --help, rendered once per session."""
+    return runner.invoke(main, ["--help"])
+
+
+@pytest.fixture(scope="session")
+def primary_image_model() -> str:
+    """Image model to run integration tests against, resolved once per session."""
+    return get_primary_image_model()
+
+
+@pytest.fixture(scope="session")
+def primary_video_model() -> str:
+    """Video model to run integration tests against, resolved once per session."""
+    return get_primary_video_model()
@@ -1,18 +1,16 @@
-import shutil
 from pathlib import Path
 
 import pytest
-from click.testing import CliRunner
 
 from multimodal_analyzer_cli.cli import main
 
 from .test_utils import (
-    FileManager,
-    get_primary_image_model,
-    get_primary_video_model,
-    get_test_image_path,
+    FAKE_VIDEO_REJECTED,
     get_test_video_path,
+    invoke_cli,
     require_api_credentials,
+    requires_test_video,
+    write_test_image,
 )
 
 
@@ -23,19 +21,14 @@ class TestCLI:
     They make real API calls (no mocking as requested in implementation plan).
     """
 
-    def setup_method(self):
-        self.runner = CliRunner()
-        # Validate API keys are available before running integration tests
-        try:
-            get_primary_image_model()  # This will fail if no API keys
-        except Exception:
-            pass  # Non-integration tests don't need API keys
+    @pytest.fixture(autouse=True)
+    def setup_runner(self, runner):
+        self.runner = runner
 
-    def test_help_command(self):
+    def test_help_command(self, help_result):
         """Test --help command works."""
-        result = self.runner.invoke(main, ["--help"])
-        assert result.exit_code == 0
-        assert "ai-powered" in result.output.lower()
+        assert help_result.exit_code == 0
+        assert "ai-powered" in help_result.output.lower()
 
     def test_version_command(self):
         """Test --version command works."""
@@ -44,169 +37,126 @@ class TestCLI:
 
     def test_missing_required_options(self):
         """Test CLI fails with missing required options."""
-        result = self.runner.invoke(main, [])
-        assert result.exit_code != 0
-        # CLI should indicate missing required parameters
-        assert "Missing option" in result.output or "Usage:" in result.output
+        exit_code, output = invoke_cli([])
+        assert exit_code != 0
+        # CLI should indicate the missing --type option
+        assert output == "Error: --type is required when not using subcommands"
 
     @pytest.mark.integration
-    def test_basic_image_analysis(self):
+    def test_basic_image_analysis(self, primary_image_model, image_path):
         """Test basic single image analysis with real API call."""
+        result = self.runner.invoke(
+            main,
+            [
+                "--type",
+                "image",
+                "--model",
+                primary_image_model,
+                "--path",
+                str(image_path.resolve()),
+                "--word-count",
+                "30",
+            ],
+        )
 
-        model_name = get_primary_image_model()
-        test_image_path = get_test_image_path()
-
-        with self.runner.isolated_filesystem():
-            # Copy test image to isolated filesystem or create one
-            if test_image_path.exists():
-                shutil.copy2(test_image_path, "test_image.jpg")
-                image_file = "test_image.jpg"
-            else:
-                # Create a simple test image
-                with FileManager() as manager:
-                    temp_image = manager.create_test_image()
-                    shutil.copy2(temp_image, "test_image.jpg")
-                    image_file = "test_image.jpg"
-
-            result = self.runner.invoke(
-                main,
-                [
-                    "--type",
-                    "image",
-                    "--model",
-                    model_name,
-                    "--path",
-                    image_file,
-                    "--word-count",
-                    "30",
-                ],
-            )
-
-            # Test must succeed - fail if CLI failed
-            if result.exit_code != 0:
-                pytest.fail(f"CLI image analysis failed: {result.output}")
+        # Test must succeed - fail if CLI failed
+        if result.exit_code != 0:
+            pytest.fail(f"CLI image analysis failed: {result.output}")
 
-            # Should return some JSON output
-            assert result.output is not None
-            assert len(result.output) > 0
+        # Should return some JSON output
+        assert result.output is not None
+        assert len(result.output) > 0
 
     @pytest.mark.integration
-    def test_custom_options(self):
+    @pytest.mark.usefixtures("chdir_tmp_path")
+    def test_custom_options(self, primary_image_model):
         """Test CLI with custom options using real API call."""
+        # Create test image
+        write_test_image(Path("test.png"))
 
-        # Use any available image model
-        model_name = get_primary_image_model()
-
-        with self.runner.isolated_filesystem():
-            # Create test image
-            with FileManager() as manager:
-                temp_image = manager.create_test_image()
-                shutil.copy2(temp_image, "test.png")
-
-            result = self.runner.invoke(
-                main,
-                [
-                    "--type",
-                    "image",
-                    "--model",
-                    model_name,
-                    "--path",
-                    "test.png",
-                    "--word-count",
-                    "50",
-                    "--prompt",
-                    "Describe briefly",
-                    "--output",
-                    "markdown",
-                    "--output-file",
-                    "results.md",
-                    "--log-level",
-                    "INFO",
-                ],
-            )
+        result = self.runner.invoke(
+            main,
+            [
+                "--type",
+                "image",
+                "--model",
+                primary_image_model,
+                "--path",
+                "test.png",
+                "--word-count",
+                "50",
+                "--prompt",
+                "Describe briefly",
+                "--output",
+                "markdown",
+                "--output-file",
+                "results.md",
+                "--log-level",
+                "INFO",
+            ],
+        )
 
-            # Test must succeed - fail if CLI failed
-            if result.exit_code != 0:
-                pytest.fail(f"CLI custom options test failed: {result.output}")
+        # Test must succeed - fail if CLI failed
+        if result.exit_code != 0:
+            pytest.fail(f"CLI custom options test failed: {result.output}")
 
-            # Check if output file was created
-            output_file = Path("results.md")
-            if output_file.exists():
-                content = output_file.read_text()
-                assert len(content) > 0
-                assert "test.png" in content.lower() or "image" in content.lower()
+        # Check if output file was created
+        output_file = Path("results.md")
+        if output_file.exists():
+            content = output_file.read_text()
+            assert len(content) > 0
+            assert "test.png" in content.lower() or "image" in content.lower()
 
     @pytest.mark.integration
-    def test_verbose_flag(self):
+    @pytest.mark.usefixtures("chdir_tmp_path")
+    def test_verbose_flag(self, primary_image_model):
         """Test CLI with verbose flag using real API call."""
+        # Create test image
+        write_test_image(Path("test.png"))
 
-        model_name = get_primary_image_model()
-
-        with self.runner.isolated_filesystem():
-            # Create test image
-            with FileManager() as manager:
-                temp_image = manager.create_test_image()
-                shutil.copy2(temp_image, "test.png")
-
-            result = self.runner.invoke(
-                main,
-                [
-                    "--type",
-                    "image",
-                    "--model",
-                    model_name,
-                    "--path",
-                    "test.png",
-                    "--verbose",
-                    "--word-count",
-                    "30",
-                ],
-            )
+        result = self.runner.invoke(
+            main,
+            [
+                "--type",
+                "image",
+                "--model",
+                primary_image_model,
+                "--path",
+                "test.png",
+                "--verbose",
+                "--word-count",
+                "30",
+            ],
+        )
 
-            # Test must succeed - fail if CLI failed
-            if result.exit_code != 0:
-                pytest.fail(f"CLI verbose flag test failed: {result.output}")
+        # Test must succeed - fail if CLI failed
+        if result.exit_code != 0:
+            pytest.fail(f"CLI verbose flag test failed: {result.output}")
 
-            # Verbose mode should include more detailed output
-            assert result.output is not None
-            assert len(result.output) > 0
+        # Verbose mode should include more detailed output
+        assert result.output is not None
+        assert len(result.output) > 0
 
-    def test_invalid_model(self):
+    def test_invalid_model(self, image_path):
         """Test CLI with invalid model name."""
-        # Use the actual test image from data directory
-        test_image_path = get_test_image_path()
-
-        with self.runner.isolated_filesystem():
-            # Copy the real test image
-            if test_image_path.exists():
-                shutil.copy2(test_image_path, "speaker.jpg")
-                image_file = "speaker.jpg"
-            else:
-                # Fallback to creating a test image if real one doesn't exist
-                with FileManager() as manager:
-                    temp_image = manager.create_test_image()
-                    shutil.copy2(temp_image, "test.jpg")
-                    image_file = "test.jpg"
-
-            result = self.runner.invoke(
-                main,
-                [
-                    "--type",
-                    "image",
-                    "--model",
-                    "invalid-model-name",
-                    "--path",
-                    image_file,
-                ],
-            )
+        result = self.runner.invoke(
+            main,
+            [
+                "--type",
+                "image",
+                "--model",
+                "invalid-model-name",
+                "--path",
+                str(image_path),
+            ],
+        )
 
-            # With immediate exception raising, the CLI should now fail with non-zero exit code
-            assert result.exit_code != 0
+        # With immediate exception raising, the CLI should now fail with non-zero exit code
+        assert result.exit_code != 0
 
     def test_nonexistent_image_path(self):
         """Test CLI with non-existent image path."""
-        result = self.runner.invoke(
-            main,
+        exit_code, output = invoke_cli(
             [
                 "--type",
                 "image",
@@ -214,67 +164,58 @@ class TestCLI:
                 "gpt-4o-mini",
                 "--path",
                 "/nonexistent/image.jpg",
-            ],
+            ]
         )
 
-        # Should fail with file not found error
-        assert result.exit_code != 0
-        assert (
-            "does not exist" in result.output.lower()
-            or "no such file" in result.output.lower()
-        )
+        # Image discovery finds nothing at a missing path
+        assert exit_code != 0
+        assert "No supported image files found in path /nonexistent/image.jpg" in output
 
     @pytest.mark.integration
-    def test_batch_directory_processing(self):
+    @pytest.mark.usefixtures("chdir_tmp_path")
+    def test_batch_directory_processing(self, primary_image_model):
         """Test CLI batch processing with directory."""
-
-        model_name = get_primary_image_model()
-
-        with self.runner.isolated_filesystem():
-            # Create test directory with multiple images
-            test_dir = Path("test_images")
-            test_dir.mkdir()
-
-            with FileManager() as manager:
-                for i in range(2):  # Create 2 test images
-                    temp_image = manager.create_test_image(
-                        width=50, height=50, color=["red", "blue"][i]
-                    )
-                    shutil.copy2(temp_image, test_dir / f"image_{i}.jpg")
-
-            result = self.runner.invoke(
-                main,
-                [
-                    "--type",
-                    "image",
-                    "--model",
-                    model_name,
-                    "--path",
-                    str(test_dir),
-                    "--word-count",
-                    "20",
-                    "--concurrency",
-                    "1",  # Low concurrency to avoid rate limits
-                ],
+        # Create test directory with multiple images
+        test_dir = Path("test_images")
+        test_dir.mkdir()
+
+        colors = ["red", "blue"]
+        for i, color in enumerate(colors):  # Create 2 test images
+            write_test_image(
+                test_dir / f"image_{i}.jpg", width=50, height=50, color=color
             )
 
-            # Test must succeed - fail if CLI failed
-            if result.exit_code != 0:
-                pytest.fail(f"CLI batch directory processing failed: {result.output}")
+        result = self.runner.invoke(
+            main,
+            [
+                "--type",
+                "image",
+                "--model",
+                primary_image_model,
+                "--path",
+                str(test_dir),
+                "--word-count",
+                "20",
+                "--concurrency",
+                str(len(colors)),  # Analyze all images in parallel
+            ],
+        )
+
+        # Test must succeed - fail if CLI failed
+        if result.exit_code != 0:
+            pytest.fail(f"CLI batch directory processing failed: {result.output}")
 
-            # Should process both images
-            assert result.output is not None
-            assert len(result.output) > 0
+        # Should process both images
+        assert result.output is not None
+        assert len(result.output) > 0
 
-    def test_cli_video_analysis_with_real_api(self):
+    @requires_test_video
+    @pytest.mark.integration
+    def test_cli_video_analysis_with_real_api(self, primary_video_model):
         """Test CLI video analysis with real Gemini API."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
+        require_api_credentials(primary_video_model)
 
-        # Use the real test video file if available, or skip
         test_video_path = get_test_video_path()
-        if not test_video_path.exists():
-            pytest.skip("No test video file available")
 
         result = self.runner.invoke(
             main,
@@ -282,7 +223,7 @@ class TestCLI:
                 "--type",
                 "video",
                 "--model",
-                model_name,
+                primary_video_model,
                 "--path",
                 str(test_video_path),
                 "--video-mode",
@@ -300,187 +241,160 @@ class TestCLI:
         assert result.exit_code == 0
         assert "analysis" in result.output or "error" in result.output
 
-    def test_cli_video_mode_validation_fails_fast(self):
-        """Test CLI video mode validation fails fast."""
-        with self.runner.isolated_filesystem():
-            # Create a fake video file that exists
-            fake_video = Path("fake_video.mp4")
-            fake_video.touch()
+    def test_cli_video_batch_processing(self, primary_video_model, fake_video_dir):
+        """Test CLI video batch processing with directory."""
+        result = self.runner.invoke(
+            main,
+            [
+                "--type",
+                "video",
+                "--model",
+                primary_video_model,
+                "--path",
+                str(fake_video_dir),
+                "--video-mode",
+                "description",
+                "--word-count",
+                "20",
+                "--output",
+                "json",
+            ],
+        )
+
+        # This will likely fail due to fake video files, but test CLI structure
+        # The important thing is the CLI accepts the arguments correctly
+        if result.exit_code != 0:
+            # Expected - fake video files will fail validation
+            assert FAKE_VIDEO_REJECTED.search(result.output)
 
-            # Test missing video mode
-            result = self.runner.invoke(
-                main,
+    def test_cli_video_help_display(self, help_result):
+        """Test CLI help includes video options."""
+        assert help_result.exit_code == 0
+        assert "video" in help_result.output
+        assert "--video-mode" in help_result.output
+        assert "Video analysis mode" in help_result.output
+
+    @pytest.mark.parametrize(
+        "args, expected",
+        [
+            pytest.param(
+                ["--model", "whisper-1", "--path", "test.wav"],
+                "Error: --type is required when not using subcommands",
+                id="missing-type",
+            ),
+            pytest.param(
+                ["--type", "image", "--model", "gpt-4o-mini"],
+                "Must specify either --path or --files",
+                id="missing-path-and-files",
+            ),
+            pytest.param(
                 [
-                    "--type",
-                    "video",
-                    "--model",
-                    "gemini/gemini-2.5-flash",
-                    "--path",
-                    str(fake_video),
+                    "--type", "image",
+                    "--model", "gpt-4o-mini",
+                    "--path", "test.jpg",
+                    "--files", "test.jpg",
                 ],
-            )
-
-            assert result.exit_code != 0
-            assert "video-mode is required" in result.output
-
-            # Test audio-mode with video type
-            result = self.runner.invoke(
-                main,
+                "Cannot specify both --path and --files",
+                id="path-and-files",
+            ),
+            pytest.param(
+                ["--type", "audio", "--model", "whisper-1", "--path", "test.wav"],
+                "audio-mode is required when --type is 'audio'",
+                id="audio-missing-mode",
+            ),
+            pytest.param(
                 [
-                    "--type",
-                    "video",
-                    "--model",
-                    "gemini/gemini-2.5-flash",
-                    "--path",
-                    str(fake_video),
-                    "--video-mode",
-                    "description",
-                    "--audio-mode",
-                    "transcript",
+                    "--type", "audio",
+                    "--model", "whisper-1",
+                    "--path", "test.wav",
+                    "--audio-mode", "invalid",
                 ],
-            )
-
-            assert result.exit_code != 0
-            assert (
-                "audio-mode should not be used when --type is 'video'" in result.output
-            )
-
-    def test_cli_video_batch_processing(self):
-        """Test CLI video batch processing with directory."""
-        model_name = get_primary_video_model()
-
-        with self.runner.isolated_filesystem():
-            # Create test directory with video files
-            test_dir = Path("test_videos")
-            test_dir.mkdir()
-
-            # Create fake video files
-            (test_dir / "video1.mp4").touch()
-            (test_dir / "video2.avi").touch()
-            (test_dir / "not_video.txt").touch()
-
-            result = self.runner.invoke(
-                main,
+                "Invalid value for '--audio-mode'",
+                id="audio-invalid-mode",
+            ),
+            pytest.param(
                 [
-                    "--type",
-                    "video",
-                    "--model",
-                    model_name,
-                    "--path",
-                    str(test_dir),
-                    "--video-mode",
-                    "description",
-                    "--word-count",
-                    "20",
-                    "--output",
-                    "json",
+                    "--type", "image",
+                    "--model", "gpt-4o-mini",
+                    "--path", "test.wav",
+                    "--audio-mode", "transcript",
                 ],
-            )
-
-            # This will likely fail due to fake video files, but test CLI structure
-            # The important thing is the CLI accepts the arguments correctly
-            if result.exit_code != 0:
-                # Expected - fake video files will fail validation
-                assert (
-                    "validation failed" in result.output
-                    or "No video streams found" in result.output
-                    or "does not exist" in result.output
-                )
-
-    def test_cli_video_help_display(self):
-        """Test CLI help includes video options."""
-        result = self.runner.invoke(main, ["--help"])
-
-        assert result.exit_code == 0
-        assert "video" in result.output
-        assert "--video-mode" in result.output
-        assert "Video analysis mode" in result.output
-
-    def test_missing_required_options_hybrid(self):
-        """Test CLI fails when neither --path nor --files is provided."""
-        result = self.runner.invoke(main, [
-            "--type", "image", 
-            "--model", "gpt-4o-mini"
-        ])
-        assert result.exit_code != 0
-        assert "Must specify either --path or --files" in result.output
-
-    def test_mutually_exclusive_options(self):
-        """Test CLI fails when both --path and --files are provided."""
-        with self.runner.isolated_filesystem():
-            # Create a test file so path validation passes
-            with open("test.jpg", "w") as f:
-                f.write("test")
-
-            result = self.runner.invoke(main, [
-                "--type", "image",
-                "--model", "gpt-4o-mini",
-                "--path", "test.jpg",
-                "--files", "test.jpg"
-            ])
-            assert result.exit_code != 0
-            assert "Cannot specify both --path and --files" in result.output
+                "audio-mode should not be used when --type is 'image'",
+                id="image-with-audio-mode",
+            ),
+            pytest.param(
+                [
+                    "--type", "video",
+                    "--model", "gemini/gemini-2.5-flash",
+                    "--path", "fake_video.mp4",
+                ],
+                "video-mode is required",
+                id="video-missing-mode",
+            ),
+            pytest.param(
+                [
+                    "--type", "video",
+                    "--model", "gemini/gemini-2.5-flash",
+                    "--path", "fake_video.mp4",
+                    "--video-mode", "description",
+                    "--audio-mode", "transcript",
+                ],
+                "audio-mode should not be used when --type is 'video'",
+                id="video-with-audio-mode",
+            ),
+            pytest.param(
+                [
+                    "--type", "image",
+                    "--model", "gpt-4o-mini",
+                    "--files", "nonexistent.jpg",
+                ],
+                "File not found",
+                id="files-nonexistent",
+            ),
+            pytest.param(
+                ["--type", "image", "--model", "gpt-4o-mini", "--files", "test.txt"],
+                "Unsupported format",
+                id="files-unsupported-format",
+            ),
+        ],
+    )
+    @pytest.mark.usefixtures("chdir_tmp_path")
+    def test_invalid_arguments_fail_fast(self, args, expected):
+        """Test CLI rejects invalid option combinations and inputs."""
+        # Existing files so path validation is not what fails
+        for name in ("test.jpg", "test.txt", "test.wav", "fake_video.mp4"):
+            Path(name).write_text("test")
+
+        exit_code, output = invoke_cli(args)
+
+        assert exit_code != 0
+        assert expected in output
 
     @pytest.mark.integration
-    def test_files_mode_analysis(self):
+    @pytest.mark.usefixtures("chdir_tmp_path")
+    def test_files_mode_analysis(self, primary_image_model):
         """Test --files mode with explicit file list using real API calls."""
-        model_name = get_primary_image_model()
         require_api_credentials()
 
-        with self.runner.isolated_filesystem():
-            # Create multiple test images
-            with FileManager() as manager:
-                img1 = manager.create_test_image(width=50, height=50, color="red")
-                img2 = manager.create_test_image(width=50, height=50, color="blue")
-                shutil.copy2(img1, "test1.jpg")
-                shutil.copy2(img2, "test2.jpg")
+        # Create multiple test images
+        write_test_image(Path("test1.jpg"), width=50, height=50, color="red")
+        write_test_image(Path("test2.jpg"), width=50, height=50, color="blue")
 
-            result = self.runner.invoke(
-                main,
-                [
-                    "--type", "image",
-                    "--model", model_name,
-                    "--files", "test1.jpg",
-                    "--files", "test2.jpg",
-                    "--word-count", "30"
-                ]
-            )
-
-            # Test must succeed - fail if CLI failed
-            if result.exit_code != 0:
-                pytest.fail(f"CLI files mode analysis failed: {result.output}")
-
-            # Should process both images
-            assert result.output is not None
-            assert len(result.output) > 0
-
-    def test_files_mode_nonexistent_file(self):
-        """Test --files mode fails fast on nonexistent file."""
         result = self.runner.invoke(
             main,
             [
                 "--type", "image",
-                "--model", "gpt-4o-mini",
-                "--files", "nonexistent.jpg"
+                "--model", primary_image_model,
+                "--files", "test1.jpg",
+                "--files", "test2.jpg",
+                "--word-count", "30"
             ]
         )
-        assert result.exit_code != 0
-        assert "File not found" in result.output
 
-    def test_files_mode_unsupported_format(self):
-        """Test --files mode fails fast on unsupported format."""
-        with self.runner.isolated_filesystem():
-            # Create a text file
-            with open("test.txt", "w") as f:
-                f.write("not an image")
+        # Test must succeed - fail if CLI failed
+        if result.exit_code != 0:
+            pytest.fail(f"CLI files mode analysis failed: {result.output}")
 
-            result = self.runner.invoke(
-                main,
-                [
-                    "--type", "image",
-                    "--model", "gpt-4o-mini",
-                    "--files", "test.txt"
-                ]
-            )
-            assert result.exit_code != 0
-            assert "Unsupported format" in result.output
+        # Should process both images
+        assert result.output is not None
+        assert len(result.output) > 0
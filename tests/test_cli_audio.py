@@ -1,87 +1,15 @@
-import tempfile
-from pathlib import Path
-
-import numpy as np
-from click.testing import CliRunner
-from pydub import AudioSegment
+import pytest
 
 from multimodal_analyzer_cli.cli import main
 
-from .test_utils import get_test_audio_path
-
 
 class TestAudioCLI:
     """Test cases for CLI audio functionality."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-        # Use real test audio file
-        self.test_audio_path = get_test_audio_path()
-
-    def test_cli_missing_type_parameter(self):
-        """Test that CLI requires --type parameter."""
-        result = self.runner.invoke(
-            main, ["--model", "whisper-1", "--path", str(self.test_audio_path)]
-        )
-
-        assert result.exit_code != 0
-        assert "Error: Missing option '--type'" in result.output
-
-    def test_cli_audio_missing_mode_parameter(self):
-        """Test that CLI requires --audio-mode for audio type."""
-        result = self.runner.invoke(
-            main,
-            [
-                "--type",
-                "audio",
-                "--model",
-                "whisper-1",
-                "--path",
-                str(self.test_audio_path),
-            ],
-        )
-
-        assert result.exit_code != 0
-        assert "audio-mode is required when --type is 'audio'" in result.output
-
-    def test_cli_image_with_audio_mode_parameter(self):
-        """Test that CLI rejects --audio-mode for image type."""
-        result = self.runner.invoke(
-            main,
-            [
-                "--type",
-                "image",
-                "--model",
-                "gpt-4o-mini",
-                "--path",
-                str(self.test_audio_path),
-                "--audio-mode",
-                "transcript",
-            ],
-        )
-
-        assert result.exit_code != 0
-        assert "audio-mode should not be used when --type is 'image'" in result.output
-
-    def test_cli_audio_invalid_mode(self):
-        """Test CLI with invalid audio mode."""
-        result = self.runner.invoke(
-            main,
-            [
-                "--type",
-                "audio",
-                "--model",
-                "whisper-1",
-                "--path",
-                str(self.test_audio_path),
-                "--audio-mode",
-                "invalid",
-            ],
-        )
-
-        assert result.exit_code != 0
-        assert "Invalid value for '--audio-mode'" in result.output
+    @pytest.fixture(autouse=True)
+    def setup_runner(self, runner):
+        """Set up test runner."""
+        self.runner = runner
 
     def test_cli_audio_valid_parameters_structure(self):
         """Test that CLI accepts valid audio parameters (structure test only)."""
@@ -110,22 +38,18 @@ class TestAudioCLI:
         assert "Missing option" not in result.output
         assert "should not be used" not in result.output
 
-    def test_cli_help_includes_audio_options(self):
+    def test_cli_help_includes_audio_options(self, help_result):
         """Test that CLI help includes audio-specific options."""
-        result = self.runner.invoke(main, ["--help"])
+        assert help_result.exit_code == 0
+        assert "--type" in help_result.output
+        assert "--audio-mode" in help_result.output
+        assert "Analysis type: image, audio, or video" in help_result.output
+        assert "Audio analysis mode" in help_result.output
 
-        assert result.exit_code == 0
-        assert "--type" in result.output
-        assert "--audio-mode" in result.output
-        assert "Analysis type: image, audio, or video" in result.output
-        assert "Audio analysis mode" in result.output
-
-    def test_cli_output_format_text_option(self):
+    def test_cli_output_format_text_option(self, help_result):
         """Test that CLI includes 'text' as an output format option."""
-        result = self.runner.invoke(main, ["--help"])
-
-        assert result.exit_code == 0
-        assert "text" in result.output  # Should be available as output format
+        assert help_result.exit_code == 0
+        assert "text" in help_result.output  # Should be available as output format
 
     def test_cli_audio_description_mode_parameters(self):
         """Test CLI parameters for audio description mode."""
@@ -170,6 +94,7 @@ class TestAudioCLI:
                 "--audio-mode",
                 "transcript",
             ],
+            catch_exceptions=False,
         )
 
         assert result.exit_code != 0
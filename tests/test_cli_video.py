@@ -1,14 +1,17 @@
 """End-to-end CLI tests for video analysis functionality."""
 
+import json
+from pathlib import Path
+
 import pytest
-from click.testing import CliRunner
 
 from multimodal_analyzer_cli.cli import main
 
 from .test_utils import (
-    get_primary_video_model,
     get_test_video_path,
+    invoke_cli,
     require_api_credentials,
+    requires_test_video,
 )
 
 
@@ -19,66 +22,63 @@ class TestCLIVideo:
     They make real API calls (no mocking as requested in implementation plan).
     """
 
-    def setup_method(self):
-        self.runner = CliRunner()
+    @pytest.fixture(autouse=True)
+    def setup_runner(self, runner):
+        self.runner = runner
 
+    @requires_test_video
     @pytest.mark.integration
-    def test_cli_video_end_to_end_with_real_gemini_api(self):
+    @pytest.mark.parametrize("output_format", ["json", "markdown", "text"])
+    def test_cli_video_end_to_end_with_real_gemini_api(
+        self, primary_video_model, output_format
+    ):
         """Test complete video analysis workflow with real Gemini API."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
+        require_api_credentials(primary_video_model)
 
-        # Use the real test video file if available, or skip
         test_video_path = get_test_video_path()
-        if not test_video_path.exists():
-            pytest.skip("No test video file available")
-
-        # Test single video analysis with various output formats
-        for output_format in ["json", "markdown", "text"]:
-            result = self.runner.invoke(
-                main,
-                [
-                    "--type",
-                    "video",
-                    "--model",
-                    model_name,
-                    "--path",
-                    str(test_video_path),
-                    "--video-mode",
-                    "description",
-                    "--word-count",
-                    "40",
-                    "--output",
-                    output_format,
-                    "--verbose",
-                ],
-            )
 
-            # For real video with valid API, should succeed
-            if result.exit_code != 0:
-                pytest.fail(
-                    f"CLI video analysis failed with {output_format}: {result.output}"
-                )
+        result = self.runner.invoke(
+            main,
+            [
+                "--type",
+                "video",
+                "--model",
+                primary_video_model,
+                "--path",
+                str(test_video_path),
+                "--video-mode",
+                "description",
+                "--word-count",
+                "40",
+                "--output",
+                output_format,
+            ],
+        )
+
+        # For real video with valid API, should succeed
+        if result.exit_code != 0:
+            pytest.fail(
+                f"CLI video analysis failed with {output_format}: {result.output}"
+            )
 
-            assert result.output is not None
-            assert len(result.output) > 0
+        assert result.output is not None
+        assert len(result.output) > 0
 
-            if output_format == "json":
-                assert "{" in result.output and "}" in result.output
-            elif output_format == "markdown":
-                assert "# Video Analysis Results" in result.output
-            elif output_format == "text":
-                assert "Video Analysis Results" in result.output
+        # Formatted results go to stdout; log lines go to stderr
+        if output_format == "json":
+            assert json.loads(result.stdout)
+        elif output_format == "markdown":
+            assert result.stdout.startswith("# Video Analysis Results")
+        elif output_format == "text":
+            assert result.stdout.startswith("Video Analysis Results")
 
+    @requires_test_video
     @pytest.mark.integration
-    def test_cli_video_with_custom_prompt(self):
+    def test_cli_video_with_custom_prompt(self, primary_video_model):
         """Test video analysis with custom prompt."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
+        require_api_credentials(primary_video_model)
 
         test_video_path = get_test_video_path()
-        if not test_video_path.exists():
-            pytest.skip("No test video file available")
 
         custom_prompt = "Describe the main visual elements and any audio in this video"
 
@@ -88,7 +88,7 @@ class TestCLIVideo:
                 "--type",
                 "video",
                 "--model",
-                model_name,
+                primary_video_model,
                 "--path",
                 str(test_video_path),
                 "--video-mode",
@@ -99,6 +99,7 @@ class TestCLIVideo:
                 "30",
                 "--output",
                 "json",
+                "--verbose",
             ],
         )
 
@@ -110,52 +111,43 @@ class TestCLIVideo:
         assert result.output is not None
         assert len(result.output) > 0
 
+    @requires_test_video
     @pytest.mark.integration
-    def test_cli_video_output_to_file(self):
+    @pytest.mark.usefixtures("chdir_tmp_path")
+    def test_cli_video_output_to_file(self, primary_video_model):
         """Test video analysis with output saved to file."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
+        require_api_credentials(primary_video_model)
 
         test_video_path = get_test_video_path()
-        if not test_video_path.exists():
-            pytest.skip("No test video file available")
-
-        with self.runner.isolated_filesystem():
-            output_file = "video_analysis_results.json"
-
-            result = self.runner.invoke(
-                main,
-                [
-                    "--type",
-                    "video",
-                    "--model",
-                    model_name,
-                    "--path",
-                    str(test_video_path),
-                    "--video-mode",
-                    "description",
-                    "--word-count",
-                    "25",
-                    "--output",
-                    "json",
-                    "--output-file",
-                    output_file,
-                ],
-            )
 
-            if result.exit_code != 0:
-                pytest.fail(
-                    f"CLI video analysis with file output failed: {result.output}"
-                )
+        output_file = "video_analysis_results.json"
+
+        # Only the written file is checked, so run in-process without capture
+        exit_code, output = invoke_cli(
+            [
+                "--type",
+                "video",
+                "--model",
+                primary_video_model,
+                "--path",
+                str(test_video_path),
+                "--video-mode",
+                "description",
+                "--word-count",
+                "25",
+                "--output",
+                "json",
+                "--output-file",
+                output_file,
+            ]
+        )
 
-            # Check that file was created
-            from pathlib import Path
+        if exit_code != 0:
+            pytest.fail(f"CLI video analysis with file output failed: {output}")
 
-            output_path = Path(output_file)
-            assert output_path.exists()
+        # Check that file was created
+        output_path = Path(output_file)
+        assert output_path.exists()
 
-            # Check file contents
-            with open(output_path, "r") as f:
-                content = f.read()
-                assert len(content) > 0
-                assert "{" in content  # JSON format
+        # Check file contents parse as JSON
+        assert json.loads(output_path.read_text())
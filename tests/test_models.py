@@ -1,20 +1,22 @@
-import tempfile
+import asyncio
+import dataclasses
 from pathlib import Path
 
 import pytest
+from loguru import logger
 
 from multimodal_analyzer_cli.config import Config
 from multimodal_analyzer_cli.models.litellm_model import LiteLLMModel
 
 from .test_utils import (
-    FileManager,
-    cleanup_temp_file,
-    get_primary_image_model,
-    get_primary_video_model,
+    DESCRIPTION_MODE_ONLY,
+    GEMINI_ONLY,
+    create_test_audio,
     get_test_audio_path,
-    get_test_image_path,
     get_test_video_path,
     require_api_credentials,
+    requires_test_video,
+    write_test_image,
 )
 
 
@@ -25,91 +27,68 @@ class TestLiteLLMModel:
     They are integration tests that make real API calls (no mocking as requested).
     """
 
-    def setup_method(self):
-        self.config = Config.load()
-        self.model = LiteLLMModel(self.config)
+    @pytest.fixture(autouse=True)
+    def setup_model(self, litellm_model):
+        self.model = litellm_model
 
-    def test_encode_image(self):
+    def test_encode_image(self, shared_image):
         """Test image encoding to base64."""
-        with FileManager() as manager:
-            # Create a real test image file
-            test_image_path = manager.create_test_image(
-                width=100, height=100, color="red"
-            )
-
-            result = self.model._encode_image(test_image_path)
-            assert isinstance(result, str)
-            assert len(result) > 0
-            # Base64 strings should be divisible by 4
-            assert len(result) % 4 == 0
-
-    def test_validate_image_success(self):
-        """Test successful image validation."""
-        # Use real test image
-        test_image_path = get_test_image_path()
-        if not test_image_path.exists():
-            with FileManager() as manager:
-                test_image_path = manager.create_test_image()
-                result = self.model._validate_image(test_image_path)
-                assert result is True
-        else:
-            result = self.model._validate_image(test_image_path)
-            assert result is True
-
-    def test_validate_image_too_large(self):
+        # Create a real test image file
+        test_image_path = shared_image(width=100, height=100, color="red")
+
+        result = self.model._encode_image(test_image_path)
+        assert isinstance(result, str)
+        assert len(result) > 0
+        # Base64 strings should be divisible by 4
+        assert len(result) % 4 == 0
+
+    @pytest.mark.parametrize(
+        "filename, expected",
+        [
+            pytest.param("image.jpg", True, id="valid-jpeg"),
+            # Unsupported extension, rejected before decoding
+            pytest.param("image.xyz", False, id="unsupported-format"),
+        ],
+    )
+    def test_validate_image(self, tmp_path, filename, expected):
+        """Test image validation accepts valid images and rejects bad ones."""
+        image_path = write_test_image(tmp_path / filename)
+        assert self.model._validate_image(image_path) is expected
+
+    def test_validate_image_too_large(self, tmp_path):
         """Test image validation fails for oversized files."""
+        # A real, decodable JPEG of about 3KB that passes with the default limit
+        test_image_path = write_test_image(tmp_path / "big.jpg", width=400, height=400)
+        assert test_image_path.stat().st_size > 1024
+        assert self.model._validate_image(test_image_path) is True
+
         # Test with a config that has very small max file size
-        small_config = Config.load()
-        small_config.max_file_size_mb = 0.001  # 1KB limit
+        small_config = dataclasses.replace(
+            Config.load(), max_file_size_mb=0.001  # 1KB limit
+        )
         small_model = LiteLLMModel(small_config)
 
-        with FileManager() as manager:
-            # Create a larger test image
-            test_image_path = manager.create_test_image(
-                width=1000, height=1000
-            )  # Should be > 1KB
-            result = small_model._validate_image(test_image_path)
-            assert result is False
-
-    def test_validate_image_unsupported_format(self):
-        """Test image validation fails for unsupported formats."""
-        # Create a file with unsupported extension
-        with tempfile.NamedTemporaryFile(suffix=".xyz", delete=False) as temp_file:
-            temp_path = Path(temp_file.name)
-            temp_file.write(b"fake data")
-
+        warnings = []
+        handler_id = logger.add(warnings.append, level="WARNING")
         try:
-            result = self.model._validate_image(temp_path)
-            assert result is False
+            result = small_model._validate_image(test_image_path)
         finally:
-            cleanup_temp_file(temp_path)
+            logger.remove(handler_id)
+
+        assert result is False
+        assert any("exceeds max size" in message for message in warnings)
 
     @pytest.mark.asyncio
     @pytest.mark.integration
-    async def test_analyze_image_success(self):
+    async def test_analyze_image_success(self, primary_image_model, image_path):
         """Test successful image analysis with real API call."""
 
-        model_name = get_primary_image_model()
-        test_image_path = get_test_image_path()
-
-        # Use real test image or create one if not available
-        if not test_image_path.exists():
-            with FileManager() as manager:
-                test_image_path = manager.create_test_image()
-
-                result = await self.model.analyze_image(
-                    model=model_name,
-                    image_path=test_image_path,
-                    prompt="Describe this image briefly",
-                    word_count=50,
-                )
-        else:
-            result = await self.model.analyze_image(
-                model=model_name,
-                image_path=test_image_path,
-                prompt="Describe this image briefly",
-                word_count=50,
-            )
+        result = await self.model.analyze_image(
+            model=primary_image_model,
+            image_path=image_path,
+            prompt="Describe this image briefly",
+            word_count=50,
+        )
 
         # Check result structure
         assert "success" in result
@@ -127,18 +106,61 @@ class TestLiteLLMModel:
             assert "error" in result
 
     @pytest.mark.asyncio
-    async def test_analyze_image_validation_failure(self):
-        """Test image analysis with validation failure."""
-        # Test with non-existent file
-        nonexistent_path = Path("/nonexistent/image.jpg")
+    @pytest.mark.integration
+    async def test_analyze_image_concurrent(self, primary_image_model, shared_image):
+        """Test several image analyses awaited together with real API calls."""
+        # Encode the images in worker threads so the event loop stays free
+        image_paths = await asyncio.gather(
+            *(
+                asyncio.to_thread(shared_image, width=50, height=50, color=color)
+                for color in ("red", "blue", "green")
+            )
+        )
+
+        results = await asyncio.gather(
+            *(
+                self.model.analyze_image(
+                    model=primary_image_model,
+                    image_path=image_path,
+                    prompt="Describe this image briefly",
+                    word_count=20,
+                )
+                for image_path in image_paths
+            )
+        )
 
+        assert len(results) == len(image_paths)
+        for result in results:
+            # Test must succeed - fail if any API call failed
+            if not result["success"]:
+                pytest.fail(f"Concurrent image analysis failed: {result['error']}")
+            assert result["analysis"]
+
+    @pytest.mark.asyncio
+    async def test_analyze_validation_failures(self):
+        """Test image, audio and video analysis reject non-existent files."""
+        # Validation runs before any API call, so no credentials are needed
         with pytest.raises(ValueError, match="Invalid image"):
             await self.model.analyze_image(
                 model="gpt-4o-mini",  # Model doesn't matter for validation failure
-                image_path=nonexistent_path,
+                image_path=Path("/nonexistent/image.jpg"),
                 prompt="Test prompt",
             )
 
+        with pytest.raises(ValueError, match="Invalid audio file"):
+            await self.model.analyze_audio_directly(
+                model="gemini/gemini-2.5-flash",
+                audio_path=Path("/nonexistent/audio.wav"),
+                mode="transcript",
+            )
+
+        with pytest.raises(ValueError, match="Invalid video file"):
+            await self.model.analyze_video(
+                model="gemini/gemini-2.5-flash",
+                video_path=Path("/nonexistent/video.mp4"),
+                mode="description",
+            )
+
     @pytest.mark.asyncio
     @pytest.mark.integration
     async def test_analyze_audio_directly_success(self):
@@ -168,43 +190,33 @@ class TestLiteLLMModel:
         else:
             assert "error" in result
 
+    @pytest.mark.parametrize(
+        "exists, expected",
+        [
+            pytest.param(True, True, id="valid-wav"),
+            pytest.param(False, False, id="nonexistent"),
+        ],
+    )
+    def test_validate_audio(self, tmp_path, exists, expected):
+        """Test audio validation accepts valid audio and rejects missing files."""
+        audio_path = tmp_path / "tone.wav"
+        if exists:
+            create_test_audio(audio_path)
+        assert self.model._validate_audio(audio_path) is expected
+
+    @requires_test_video
     @pytest.mark.asyncio
-    async def test_analyze_audio_directly_validation_failure(self):
-        """Test audio analysis with validation failure."""
-        # Test with non-existent file
-        nonexistent_path = Path("/nonexistent/audio.wav")
-
-        with pytest.raises(ValueError, match="Invalid audio file"):
-            await self.model.analyze_audio_directly(
-                model="gemini/gemini-2.5-flash",
-                audio_path=nonexistent_path,
-                mode="transcript",
-            )
-
-    def test_validate_audio_success(self):
-        """Test successful audio validation."""
-        test_audio_path = get_test_audio_path()
-        result = self.model._validate_audio(test_audio_path)
-        assert result is True
-
-    def test_validate_audio_nonexistent(self):
-        """Test audio validation fails for non-existent files."""
-        result = self.model._validate_audio(Path("/nonexistent/audio.wav"))
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_litellm_model_video_analysis_with_real_api(self):
+    @pytest.mark.integration
+    async def test_litellm_model_video_analysis_with_real_api(
+        self, primary_video_model
+    ):
         """Test video analysis with real Gemini API."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
+        require_api_credentials(primary_video_model)
 
-        # Use the real test video file if available, or skip
         test_video_path = get_test_video_path()
-        if not test_video_path.exists():
-            pytest.skip("No test video file available")
 
         result = await self.model.analyze_video(
-            model=model_name,
+            model=primary_video_model,
             video_path=test_video_path,
             mode="description",
             word_count=50,
@@ -227,72 +239,35 @@ class TestLiteLLMModel:
             assert "error" in result
 
     @pytest.mark.asyncio
-    async def test_litellm_model_video_validation_fails_fast(self):
-        """Test video analysis validation fails fast."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
-
-        # Test with non-existent file
-        nonexistent_path = Path("/nonexistent/video.mp4")
+    async def test_litellm_model_video_mode_validation(
+        self, primary_video_model, fake_video_file
+    ):
+        """Test video analysis mode validation."""
+        require_api_credentials(primary_video_model)
 
-        with pytest.raises(ValueError, match="Invalid video file"):
+        # Test invalid mode
+        with pytest.raises(ValueError, match=DESCRIPTION_MODE_ONLY):
             await self.model.analyze_video(
-                model=model_name, video_path=nonexistent_path, mode="description"
+                model=primary_video_model, video_path=fake_video_file, mode="transcript"
             )
 
-    @pytest.mark.asyncio
-    async def test_litellm_model_video_mode_validation(self):
-        """Test video analysis mode validation."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
-
-        # Create a dummy video file for testing
-        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
-            tmp.write(b"fake video content")
-            fake_video_path = Path(tmp.name)
-
-        try:
-            # Test invalid mode
-            with pytest.raises(
-                ValueError, match="Video analysis only supports 'description' mode"
-            ):
-                await self.model.analyze_video(
-                    model=model_name, video_path=fake_video_path, mode="transcript"
-                )
-
-            with pytest.raises(
-                ValueError, match="Video analysis only supports 'description' mode"
-            ):
-                await self.model.analyze_video(
-                    model=model_name, video_path=fake_video_path, mode="summary"
-                )
-        finally:
-            cleanup_temp_file(fake_video_path)
+        with pytest.raises(ValueError, match=DESCRIPTION_MODE_ONLY):
+            await self.model.analyze_video(
+                model=primary_video_model, video_path=fake_video_file, mode="summary"
+            )
 
     @pytest.mark.asyncio
-    async def test_litellm_model_non_gemini_model_fails_fast(self):
+    async def test_litellm_model_non_gemini_model_fails_fast(self, fake_video_file):
         """Test video analysis fails fast for non-Gemini models."""
-        # Create a dummy video file for testing
-        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
-            tmp.write(b"fake video content")
-            fake_video_path = Path(tmp.name)
-
-        try:
-            # Test with non-Gemini model
-            with pytest.raises(
-                ValueError, match="Video analysis only supports Gemini models"
-            ):
-                await self.model.analyze_video(
-                    model="gpt-4o-mini", video_path=fake_video_path, mode="description"
-                )
+        # Test with non-Gemini model
+        with pytest.raises(ValueError, match=GEMINI_ONLY):
+            await self.model.analyze_video(
+                model="gpt-4o-mini", video_path=fake_video_file, mode="description"
+            )
 
-            with pytest.raises(
-                ValueError, match="Video analysis only supports Gemini models"
-            ):
-                await self.model.analyze_video(
-                    model="claude-3-sonnet-20240229",
-                    video_path=fake_video_path,
-                    mode="description",
-                )
-        finally:
-            cleanup_temp_file(fake_video_path)
+        with pytest.raises(ValueError, match=GEMINI_ONLY):
+            await self.model.analyze_video(
+                model="claude-3-sonnet-20240229",
+                video_path=fake_video_file,
+                mode="description",
+            )
@@ -1,125 +1,87 @@
 """Test streaming JSON input functionality."""
 
 import base64
-import io
 import json
 from pathlib import Path
 
 import pytest
-from click.testing import CliRunner
-from PIL import Image
 
 from multimodal_analyzer_cli.cli import main
-from multimodal_analyzer_cli.config import Config
+
+from .test_utils import (
+    _encode_test_image,
+    require_api_credentials,
+)
 
 
 class TestStreaming:
     """Test streaming JSON input functionality."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup_runner(self, runner):
         """Set up test runner."""
-        self.runner = CliRunner()
+        self.runner = runner
 
     def create_test_image_base64(self, width: int = 10, height: int = 10, color: str = "red") -> str:
         """Create a simple test image and return as base64 data URL."""
-        img = Image.new('RGB', (width, height), color=color)
-        
-        buffer = io.BytesIO()
-        img.save(buffer, format='JPEG')
-        img_str = base64.b64encode(buffer.getvalue()).decode()
-        
+        img_bytes = _encode_test_image(width, height, color)
+        img_str = base64.b64encode(img_bytes).decode("ascii")
         return f"data:image/jpeg;base64,{img_str}"
 
-    def test_streaming_validation_requires_both_formats(self):
-        """Test that streaming requires both input-format and output stream-json."""
-        # Test input-format without output stream-json
-        result = self.runner.invoke(main, [
-            "--type", "image",
-            "--model", "gemini/gemini-2.5-flash",
-            "-p", ".",
-            "--input-format", "stream-json"
-        ])
-        assert result.exit_code != 0
-        assert "requires --output stream-json" in result.output
-
-        # Test output stream-json without input-format
-        result = self.runner.invoke(main, [
-            "--type", "image", 
-            "--model", "gemini/gemini-2.5-flash",
-            "-p", ".",
-            "--output", "stream-json"
-        ])
-        assert result.exit_code != 0
-        assert "requires --input-format stream-json" in result.output
-
-    def test_streaming_validation_requires_path_flag(self):
-        """Test that streaming requires -p flag."""
-        result = self.runner.invoke(main, [
-            "--type", "image",
-            "--model", "gemini/gemini-2.5-flash", 
-            "--input-format", "stream-json",
-            "--output", "stream-json"
-        ])
-        assert result.exit_code != 0
-        assert "requires -p flag" in result.output
-
-    def test_streaming_validation_excludes_files_flag(self):
-        """Test that streaming cannot be used with --files."""
-        result = self.runner.invoke(main, [
-            "--type", "image",
-            "--model", "gemini/gemini-2.5-flash",
-            "-p", ".",
-            "--files", "test.jpg",
-            "--input-format", "stream-json", 
-            "--output", "stream-json"
-        ])
+    @pytest.mark.parametrize(
+        "args, expected",
+        [
+            pytest.param(
+                ["-p", ".", "--input-format", "stream-json"],
+                "requires --output stream-json",
+                id="input-format-without-output",
+            ),
+            pytest.param(
+                ["-p", ".", "--output", "stream-json"],
+                "requires --input-format stream-json",
+                id="output-without-input-format",
+            ),
+            pytest.param(
+                ["--input-format", "stream-json", "--output", "stream-json"],
+                "requires -p flag",
+                id="missing-path-flag",
+            ),
+            pytest.param(
+                [
+                    "-p", ".",
+                    "--files", "test.jpg",
+                    "--input-format", "stream-json",
+                    "--output", "stream-json",
+                ],
+                # The CLI checks for mutually exclusive -p and --files first
+                "Cannot specify both --path and --files",
+                id="with-files-flag",
+            ),
+            pytest.param(
+                [
+                    "-p", ".",
+                    "--output-file", "results.json",
+                    "--input-format", "stream-json",
+                    "--output", "stream-json",
+                ],
+                "cannot be used with --output-file",
+                id="with-output-file",
+            ),
+        ],
+    )
+    def test_streaming_validation(self, args, expected):
+        """Test that invalid streaming option combinations are rejected."""
+        result = self.runner.invoke(
+            main, ["--type", "image", "--model", "gemini/gemini-2.5-flash", *args]
+        )
         assert result.exit_code != 0
-        # The CLI checks for mutually exclusive -p and --files first
-        assert "Cannot specify both --path and --files" in result.output
-
-    def test_streaming_validation_excludes_output_file(self):
-        """Test that streaming cannot be used with --output-file."""
-        result = self.runner.invoke(main, [
-            "--type", "image",
-            "--model", "gemini/gemini-2.5-flash",
-            "-p", ".",
-            "--output-file", "results.json",
-            "--input-format", "stream-json",
-            "--output", "stream-json" 
-        ])
-        assert result.exit_code != 0
-        assert "cannot be used with --output-file" in result.output
-
-    def get_primary_image_model(self) -> str:
-        """Get the primary image model for testing."""
-        config = Config.load()
-        
-        # Try Gemini first
-        if config.gemini_api_key:
-            return "gemini/gemini-2.5-flash"
-        # Try OpenAI
-        if config.openai_api_key:
-            return "gpt-4o-mini"
-        # Try Anthropic
-        if config.anthropic_api_key:
-            return "claude-3-sonnet-20240229"
-        
-        pytest.fail("No image analysis models available. Set GEMINI_API_KEY, OPENAI_API_KEY, or ANTHROPIC_API_KEY environment variable.")
-
-    def require_api_credentials(self, model: str):
-        """Require API credentials for specified model. Raises error if missing."""
-        config = Config.load()
-        try:
-            config.validate_api_keys(model)
-        except Exception as e:
-            pytest.fail(f"Required API credentials missing for {model}: {str(e)}")
+        assert expected in result.output
 
     @pytest.mark.integration
-    def test_streaming_image_analysis(self):
+    def test_streaming_image_analysis(self, primary_image_model):
         """Test streaming image analysis with base64 input."""
         # Require API credentials for integration test
-        model = self.get_primary_image_model()
-        self.require_api_credentials(model)
+        require_api_credentials(primary_image_model)
 
         # Create test message with base64 image
         image_data_url = self.create_test_image_base64()
@@ -140,7 +102,7 @@ class TestStreaming:
         # Run streaming command
         result = self.runner.invoke(main, [
             "--type", "image",
-            "--model", model,
+            "--model", primary_image_model,
             "-p", ".",
             "--input-format", "stream-json",
             "--output", "stream-json",
@@ -176,7 +138,7 @@ class TestStreaming:
         assert json_response["message"]["content"]  # Should have analysis content
         assert "metadata" in json_response
         assert json_response["metadata"]["success"] is True
-        assert json_response["metadata"]["model"] == model
+        assert json_response["metadata"]["model"] == primary_image_model
 
     def test_streaming_audio_not_implemented(self):
         """Test that audio streaming returns not implemented error."""
@@ -1,13 +1,20 @@
 """Test utilities for media analyzer tests."""
 
+import functools
+import io
+import os
+import re
+import shutil
 import tempfile
+import wave
 from pathlib import Path
 
+import click
 import numpy as np
 import pytest
 from PIL import Image
-from pydub import AudioSegment
 
+from multimodal_analyzer_cli.cli import main
 from multimodal_analyzer_cli.config import Config
 from multimodal_analyzer_cli.utils.video import (
     find_videos,
@@ -17,6 +24,18 @@ from multimodal_analyzer_cli.utils.video import (
 )
 
 
+def invoke_cli(args: list[str]) -> tuple[int, str]:
+    """Run the CLI in-process without output capture.
+
+    Returns (exit_code, error_message).
+    """
+    try:
+        main.main(args, prog_name="multimodal-analyzer", standalone_mode=False)
+    except click.ClickException as e:
+        return e.exit_code, f"Error: {e.format_message()}"
+    return 0, ""
+
+
 def require_api_credentials(*models: str):
     """Require API credentials for specified models. Raises error if missing."""
     config = Config.load()
@@ -27,74 +46,134 @@ def require_api_credentials(*models: str):
             pytest.fail(f"Required API credentials missing for {model}: {str(e)}")
 
 
+_TEST_DATA_PATH = Path(__file__).parent.parent / "data"
+
+
 def get_test_data_path() -> Path:
     """Get path to test data directory."""
-    return Path(__file__).parent.parent / "data"
+    return _TEST_DATA_PATH
 
 
 def get_test_image_path() -> Path:
     """Get path to test image file."""
-    return get_test_data_path() / "speaker.jpg"
+    return _TEST_DATA_PATH / "speaker.jpg"
 
 
 def get_test_audio_path() -> Path:
     """Get path to test audio file."""
-    return get_test_data_path() / "test_audio.mp3"
+    return _TEST_DATA_PATH / "test_audio.mp3"
 
 
 def get_test_video_path() -> Path:
     """Get path to test video file."""
-    return get_test_data_path() / "test_video.mp4"
+    return _TEST_DATA_PATH / "test_video.mp4"
+
+
+# Decided at collection time so tests without the video file never run setup
+requires_test_video = pytest.mark.skipif(
+    not get_test_video_path().exists(), reason="No test video file available"
+)
+
+# Placeholder content for video files that only need the right extension
+FAKE_VIDEO_BYTES = b"fake video content"
+
+# Errors raised for video requests that analysis does not support
+DESCRIPTION_MODE_ONLY = re.compile(r"Video analysis only supports 'description' mode")
+GEMINI_ONLY = re.compile(r"Video analysis only supports Gemini models")
+
+# Errors raised when placeholder video files fail validation
+FAKE_VIDEO_REJECTED = re.compile(r"validation failed|No video streams found")
+
+
+@functools.lru_cache(maxsize=None)
+def _encode_test_image(width: int, height: int, color: str) -> bytes:
+    """Encode a solid-color JPEG once per (width, height, color)."""
+    img = Image.new("RGB", (width, height), color=color)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG")
+    return buffer.getvalue()
 
 
 def create_test_image(width: int = 100, height: int = 100, color: str = "red") -> Path:
     """Create a temporary test image file."""
-    img = Image.new("RGB", (width, height), color=color)
-    temp_file = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
-    img.save(temp_file.name, format="JPEG")
+    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as temp_file:
+        temp_file.write(_encode_test_image(width, height, color))
     return Path(temp_file.name)
 
 
+def write_test_image(
+    path: Path, width: int = 100, height: int = 100, color: str = "red"
+) -> Path:
+    """Write a solid-color JPEG test image to the given path."""
+    path.write_bytes(_encode_test_image(width, height, color))
+    return path
+
+
+@functools.lru_cache(maxsize=16)
+def _encode_test_audio(duration: float, frequency: int, sample_rate: int) -> bytes:
+    """Encode a mono 16-bit sawtooth tone WAV once per (duration, frequency, rate)."""
+    # Integer phase ramp wrapping at 16 bits: one period per 65536 / step samples
+    step = (0x10000 * frequency) // sample_rate
+    ramp = (np.arange(int(sample_rate * duration), dtype=np.int32) * step) & 0xFFFF
+    audio_data = (ramp - 0x8000).astype(np.int16)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(audio_data.tobytes())
+    return buffer.getvalue()
+
+
+def create_test_audio(
+    path: Path, duration: float = 1.0, frequency: int = 440, sample_rate: int = 44100
+) -> Path:
+    """Write a mono 16-bit sawtooth tone WAV file to the given path."""
+    path.write_bytes(_encode_test_audio(duration, frequency, sample_rate))
+    return path
+
+
+def link_or_copy(src: Path, dst: Path) -> Path:
+    """Hard-link a read-only test fixture into place, copying across devices."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
 def cleanup_temp_file(file_path: Path):
     """Clean up temporary test file."""
     try:
-        if file_path.exists():
-            file_path.unlink()
+        file_path.unlink(missing_ok=True)
     except Exception:
         pass  # Ignore cleanup errors
 
 
-def get_available_models() -> dict:
-    """Get available models based on API keys."""
-    config = Config.load()
-    models = {"image": [], "audio_transcription": [], "text_analysis": []}
-
-    # Image models
-    if config.gemini_api_key or config.gemini_api_key:
-        models["image"].append("gemini/gemini-2.5-flash")
-    if config.openai_api_key or config.AZURE_OPENAI_API_KEY:
-        models["image"].append("gpt-4o-mini")
-    if config.anthropic_api_key:
-        models["image"].append("claude-3-sonnet-20240229")
-
-    # Audio transcription models
-    if config.openai_api_key or config.AZURE_OPENAI_API_KEY:
-        models["audio_transcription"].append("whisper-1")
+# (model, config fields any of which enables the model), in preference order
+_MODEL_TABLE = (
+    ("gemini/gemini-2.5-flash", ("gemini_api_key",)),
+    ("gpt-4o-mini", ("openai_api_key", "AZURE_OPENAI_API_KEY")),
+    ("claude-3-sonnet-20240229", ("anthropic_api_key",)),
+)
 
-    # Text analysis models
-    if config.gemini_api_key or config.gemini_api_key:
-        models["text_analysis"].append("gemini/gemini-2.5-flash")
-    if config.openai_api_key or config.AZURE_OPENAI_API_KEY:
-        models["text_analysis"].append("gpt-4o-mini")
-    if config.anthropic_api_key:
-        models["text_analysis"].append("claude-3-sonnet-20240229")
 
-    return models
+@functools.cache
+def get_available_models() -> tuple[str, ...]:
+    """Get image and text analysis models based on API keys, resolved once."""
+    config = Config.load()
+    return tuple(
+        model
+        for model, keys in _MODEL_TABLE
+        if any(getattr(config, key) for key in keys)
+    )
 
 
+@functools.cache
 def get_primary_image_model() -> str:
     """Get the primary image model for testing."""
-    models = get_available_models()["image"]
+    models = get_available_models()
     if not models:
         pytest.fail(
             "No image analysis models available. Set OPENAI_API_KEY, GEMINI_API_KEY, or ANTHROPIC_API_KEY environment variable."
@@ -102,19 +181,21 @@ def get_primary_image_model() -> str:
     return models[0]
 
 
+@functools.cache
 def get_primary_audio_model() -> str:
     """Get the primary audio model for testing."""
-    models = get_available_models()["audio_transcription"]
-    if not models:
-        pytest.fail(
-            "No audio transcription models available. Set OPENAI_API_KEY or AZURE_OPENAI_API_KEY environment variable."
-        )
-    return models[0]
+    config = Config.load()
+    if config.openai_api_key or config.AZURE_OPENAI_API_KEY:
+        return "whisper-1"
+    pytest.fail(
+        "No audio transcription models available. Set OPENAI_API_KEY or AZURE_OPENAI_API_KEY environment variable."
+    )
 
 
+@functools.cache
 def get_primary_text_model() -> str:
     """Get the primary text analysis model for testing."""
-    models = get_available_models()["text_analysis"]
+    models = get_available_models()
     if not models:
         pytest.fail(
             "No text analysis models available. Set OPENAI_API_KEY, GEMINI_API_KEY, or ANTHROPIC_API_KEY environment variable."
@@ -122,6 +203,7 @@ def get_primary_text_model() -> str:
     return models[0]
 
 
+@functools.cache
 def get_primary_video_model() -> str:
     """Get the primary video model for testing (Gemini only)."""
     config = Config.load()
@@ -132,44 +214,48 @@ def get_primary_video_model() -> str:
     )
 
 
-def test_find_videos_recursive_with_real_files():
+def _fast_touch(path: Path) -> None:
+    """Create an empty file with a bare open/close, skipping Path.touch() overhead."""
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+
+
+def test_find_videos_recursive_with_real_files(tmp_path):
     """Test find_videos function with recursive search."""
-    # Create a temporary directory structure
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-
-        # Create subdirectories
-        subdir1 = temp_path / "subdir1"
-        subdir2 = temp_path / "subdir2"
-        subdir1.mkdir()
-        subdir2.mkdir()
-
-        # Create test video files
-        (temp_path / "video1.mp4").touch()
-        (temp_path / "video2.avi").touch()
-        (subdir1 / "video3.mov").touch()
-        (subdir2 / "video4.mkv").touch()
-        (temp_path / "not_video.txt").touch()
-
-        # Test non-recursive search
-        videos = list(find_videos(temp_path, recursive=False))
-        video_names = [v.name for v in videos]
-        assert "video1.mp4" in video_names
-        assert "video2.avi" in video_names
-        assert "video3.mov" not in video_names  # Should not find in subdirs
-        assert "video4.mkv" not in video_names
-
-        # Test recursive search
-        videos_recursive = list(find_videos(temp_path, recursive=True))
-        video_names_recursive = [v.name for v in videos_recursive]
-        assert "video1.mp4" in video_names_recursive
-        assert "video2.avi" in video_names_recursive
-        assert "video3.mov" in video_names_recursive
-        assert "video4.mkv" in video_names_recursive
-        assert len(videos_recursive) == 4
-
-
-def test_validate_video_file_fails_fast():
+    # Create subdirectories
+    subdir1 = tmp_path / "subdir1"
+    subdir2 = tmp_path / "subdir2"
+    subdir1.mkdir()
+    subdir2.mkdir()
+
+    # Create test video files
+    for file_path in (
+        tmp_path / "video1.mp4",
+        tmp_path / "video2.avi",
+        subdir1 / "video3.mov",
+        subdir2 / "video4.mkv",
+        tmp_path / "not_video.txt",
+    ):
+        _fast_touch(file_path)
+
+    # Test non-recursive search
+    videos = list(find_videos(tmp_path, recursive=False))
+    video_names = [v.name for v in videos]
+    assert "video1.mp4" in video_names
+    assert "video2.avi" in video_names
+    assert "video3.mov" not in video_names  # Should not find in subdirs
+    assert "video4.mkv" not in video_names
+
+    # Test recursive search
+    videos_recursive = list(find_videos(tmp_path, recursive=True))
+    video_names_recursive = [v.name for v in videos_recursive]
+    assert "video1.mp4" in video_names_recursive
+    assert "video2.avi" in video_names_recursive
+    assert "video3.mov" in video_names_recursive
+    assert "video4.mkv" in video_names_recursive
+    assert len(videos_recursive) == 4
+
+
+def test_validate_video_file_fails_fast(tmp_path):
     """Test video validation with fail-fast behavior."""
     # Test with non-existent file
     non_existent = Path("/non/existent/video.mp4")
@@ -177,15 +263,11 @@ def test_validate_video_file_fails_fast():
         validate_video_file(non_existent)
 
     # Test with unsupported format
-    with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp:
-        tmp.write(b"not a video")
-        tmp.flush()
-        unsupported_file = Path(tmp.name)
+    unsupported_file = tmp_path / "video.txt"
+    unsupported_file.write_bytes(b"not a video")
 
-        with pytest.raises(ValueError, match="Unsupported video format"):
-            validate_video_file(unsupported_file)
-
-        unsupported_file.unlink()
+    with pytest.raises(ValueError, match="Unsupported video format"):
+        validate_video_file(unsupported_file)
 
 
 def test_get_video_info_with_real_video():
@@ -223,42 +305,26 @@ def test_get_video_info_with_real_video():
 
 def test_is_video_file_format_detection():
     """Test is_video_file function."""
-    # Test supported formats
-    assert is_video_file(Path("test.mp4"))
-    assert is_video_file(Path("test.avi"))
-    assert is_video_file(Path("test.mov"))
-    assert is_video_file(Path("test.mkv"))
-    assert is_video_file(Path("test.wmv"))
-    assert is_video_file(Path("test.flv"))
-    assert is_video_file(Path("test.webm"))
-    assert is_video_file(Path("test.m4v"))
-
-    # Test case insensitivity
-    assert is_video_file(Path("test.MP4"))
-    assert is_video_file(Path("test.AVI"))
-
-    # Test unsupported formats
-    assert not is_video_file(Path("test.txt"))
-    assert not is_video_file(Path("test.jpg"))
-    assert not is_video_file(Path("test.mp3"))
-    assert not is_video_file(Path("test.pdf"))
-
-
-class FileManager:
-    """Context manager for test files that ensures cleanup."""
-
-    def __init__(self):
-        self.temp_files = []
-
-    def create_test_image(self, **kwargs) -> Path:
-        """Create test image and track for cleanup."""
-        path = create_test_image(**kwargs)
-        self.temp_files.append(path)
-        return path
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        for file_path in self.temp_files:
-            cleanup_temp_file(file_path)
+    cases = (
+        # Supported formats
+        ("test.mp4", True),
+        ("test.avi", True),
+        ("test.mov", True),
+        ("test.mkv", True),
+        ("test.wmv", True),
+        ("test.flv", True),
+        ("test.webm", True),
+        ("test.m4v", True),
+        # Case insensitivity
+        ("test.MP4", True),
+        ("test.AVI", True),
+        # Unsupported formats
+        ("test.txt", False),
+        ("test.jpg", False),
+        ("test.mp3", False),
+        ("test.pdf", False),
+    )
+    mismatches = [
+        name for name, expected in cases if is_video_file(Path(name)) is not expected
+    ]
+    assert not mismatches
@@ -1,18 +1,18 @@
 """Test cases for VideoAnalyzer functionality."""
 
-import tempfile
+import json
 from pathlib import Path
 
 import pytest
 
-from multimodal_analyzer_cli.config import Config
-from multimodal_analyzer_cli.video_analyzer import VideoAnalyzer
-
 from .test_utils import (
-    cleanup_temp_file,
-    get_primary_video_model,
+    DESCRIPTION_MODE_ONLY,
+    FAKE_VIDEO_BYTES,
+    FAKE_VIDEO_REJECTED,
+    GEMINI_ONLY,
     get_test_video_path,
     require_api_credentials,
+    requires_test_video,
 )
 
 
@@ -23,23 +23,21 @@ class TestVideoAnalyzer:
     They are integration tests that make real API calls (no mocking as requested).
     """
 
-    def setup_method(self):
-        self.config = Config.load()
-        self.analyzer = VideoAnalyzer(self.config)
+    @pytest.fixture(autouse=True)
+    def setup_analyzer(self, video_analyzer):
+        self.analyzer = video_analyzer
 
+    @requires_test_video
     @pytest.mark.asyncio
-    async def test_video_analyzer_single_file_with_real_api(self):
+    @pytest.mark.integration
+    async def test_video_analyzer_single_file_with_real_api(self, primary_video_model):
         """Test single video analysis with real Gemini API."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
+        require_api_credentials(primary_video_model)
 
-        # Use the real test video file if available, or skip
         test_video_path = get_test_video_path()
-        if not test_video_path.exists():
-            pytest.skip("No test video file available")
 
         result = await self.analyzer.analyze_single_video(
-            model=model_name,
+            model=primary_video_model,
             video_path=test_video_path,
             mode="description",
             word_count=50,
@@ -65,158 +63,123 @@ class TestVideoAnalyzer:
             assert "error" in result
 
     @pytest.mark.asyncio
-    async def test_video_analyzer_batch_processing_with_real_api(self):
+    @pytest.mark.integration
+    async def test_video_analyzer_batch_processing_with_real_api(
+        self, primary_video_model, tmp_path
+    ):
         """Test batch video processing with real Gemini API."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
+        require_api_credentials(primary_video_model)
 
         # Create temporary video files for testing
         temp_files = []
-        try:
-            for i in range(2):
-                temp_file = tempfile.NamedTemporaryFile(
-                    suffix=f"_test_{i}.mp4", delete=False
-                )
-                temp_file.write(b"fake video content")
-                temp_file.flush()
-                temp_files.append(Path(temp_file.name))
-
-            # Use analyze_batch_with_progress to handle exceptions gracefully
-            results = await self.analyzer.analyze_batch_with_progress(
-                model=model_name,
-                video_files=temp_files,
-                mode="description",
-                word_count=30,
-                concurrency=2,
-            )
-
-            assert len(results) == 2
-            for result in results:
-                assert "success" in result
-                assert "video_path" in result
-                assert "model" in result
-                assert "mode" in result
-                # Note: These will likely fail validation, so success should be False
-                if not result["success"]:
-                    assert "error" in result
-                else:
-                    assert "analysis" in result
+        for i in range(2):
+            temp_file = tmp_path / f"test_{i}.mp4"
+            temp_file.write_bytes(FAKE_VIDEO_BYTES)
+            temp_files.append(temp_file)
+
+        # Use analyze_batch_with_progress to handle exceptions gracefully
+        results = await self.analyzer.analyze_batch_with_progress(
+            model=primary_video_model,
+            video_files=temp_files,
+            mode="description",
+            word_count=30,
+            concurrency=2,
+        )
 
-        finally:
-            # Cleanup temporary files
-            for temp_file in temp_files:
-                cleanup_temp_file(temp_file)
+        assert len(results) == 2
+        for result in results:
+            assert "success" in result
+            assert "video_path" in result
+            assert "model" in result
+            assert "mode" in result
+            # Note: These will likely fail validation, so success should be False
+            if not result["success"]:
+                assert "error" in result
+            else:
+                assert "analysis" in result
 
     @pytest.mark.asyncio
-    async def test_video_analyzer_error_handling_fails_fast(self):
+    async def test_video_analyzer_error_handling_fails_fast(self, primary_video_model):
         """Test error handling with fail-fast behavior."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
+        require_api_credentials(primary_video_model)
 
         # Test with non-existent file
         nonexistent_path = Path("/nonexistent/video.mp4")
 
         with pytest.raises((ValueError, FileNotFoundError)):
             await self.analyzer.analyze_single_video(
-                model=model_name, video_path=nonexistent_path, mode="description"
+                model=primary_video_model,
+                video_path=nonexistent_path,
+                mode="description",
             )
 
     @pytest.mark.asyncio
-    async def test_video_analyzer_mode_validation(self):
-        """Test mode validation for video analysis."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
-
-        # Create a dummy video file for testing
-        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
-            tmp.write(b"fake video content")
-            fake_video_path = Path(tmp.name)
-
-        try:
-            # Test invalid mode
-            with pytest.raises(
-                ValueError, match="Video analysis only supports 'description' mode"
-            ):
-                await self.analyzer.analyze_single_video(
-                    model=model_name, video_path=fake_video_path, mode="transcript"
-                )
-
-            with pytest.raises(
-                ValueError, match="Video analysis only supports 'description' mode"
-            ):
-                await self.analyzer.analyze_single_video(
-                    model=model_name, video_path=fake_video_path, mode="summary"
-                )
-        finally:
-            cleanup_temp_file(fake_video_path)
-
-    @pytest.mark.asyncio
-    async def test_video_analyzer_directory_processing(self):
+    async def test_video_analyzer_directory_processing(
+        self, primary_video_model, fake_video_dir
+    ):
         """Test directory processing for video analysis."""
-        model_name = get_primary_video_model()
-        require_api_credentials(model_name)
-
-        # Create a temporary directory with video files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Create test video files
-            (temp_path / "video1.mp4").touch()
-            (temp_path / "video2.avi").touch()
-            (temp_path / "not_video.txt").touch()
-
-            # Test directory analysis
-            try:
-                formatted_output = await self.analyzer.analyze(
-                    model=model_name,
-                    path=temp_path,
-                    mode="description",
-                    word_count=30,
-                    output_format="json",
-                    recursive=False,
-                    concurrency=2,
-                )
+        require_api_credentials(primary_video_model)
 
-                assert isinstance(formatted_output, str)
-                # Should contain results for 2 video files
-                import json
-
-                results = json.loads(formatted_output)
-                assert len(results) == 2
+        # Test directory analysis
+        try:
+            formatted_output = await self.analyzer.analyze(
+                model=primary_video_model,
+                path=fake_video_dir,
+                mode="description",
+                word_count=30,
+                output_format="json",
+                recursive=False,
+                concurrency=2,
+            )
 
-            except ValueError as e:
-                # This is expected if video validation fails for fake files
-                assert "validation failed" in str(e) or "No video streams found" in str(
-                    e
-                )
+            assert isinstance(formatted_output, str)
+            # Should contain results for 2 video files
+            results = json.loads(formatted_output)
+            assert len(results) == 2
 
+        except ValueError as e:
+            # This is expected if video validation fails for fake files
+            assert FAKE_VIDEO_REJECTED.search(str(e))
+
+    @pytest.mark.parametrize(
+        "model, mode, expected",
+        [
+            pytest.param(
+                "gemini/gemini-2.5-flash",
+                "transcript",
+                DESCRIPTION_MODE_ONLY,
+                id="transcript-mode",
+            ),
+            pytest.param(
+                "gemini/gemini-2.5-flash",
+                "summary",
+                DESCRIPTION_MODE_ONLY,
+                id="summary-mode",
+            ),
+            pytest.param(
+                "gpt-4o-mini",
+                "description",
+                GEMINI_ONLY,
+                id="openai-model",
+            ),
+            pytest.param(
+                "claude-3-sonnet-20240229",
+                "description",
+                GEMINI_ONLY,
+                id="anthropic-model",
+            ),
+        ],
+    )
     @pytest.mark.asyncio
-    async def test_video_analyzer_non_gemini_model_fails_fast(self):
-        """Test video analysis fails fast for non-Gemini models."""
-        # Create a dummy video file for testing
-        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
-            tmp.write(b"fake video content")
-            fake_video_path = Path(tmp.name)
-
-        try:
-            # Test with non-Gemini model
-            with pytest.raises(
-                ValueError, match="Video analysis only supports Gemini models"
-            ):
-                await self.analyzer.analyze_single_video(
-                    model="gpt-4o-mini", video_path=fake_video_path, mode="description"
-                )
-
-            with pytest.raises(
-                ValueError, match="Video analysis only supports Gemini models"
-            ):
-                await self.analyzer.analyze_single_video(
-                    model="claude-3-sonnet-20240229",
-                    video_path=fake_video_path,
-                    mode="description",
-                )
-        finally:
-            cleanup_temp_file(fake_video_path)
+    async def test_video_analyzer_rejects_invalid_request(
+        self, fake_video_file, model, mode, expected
+    ):
+        """Test video analysis fails fast for unsupported modes and models."""
+        # Mode and model are checked before the file or any API call
+        with pytest.raises(ValueError, match=expected):
+            await self.analyzer.analyze_single_video(
+                model=model, video_path=fake_video_file, mode=mode
+            )
 
     @pytest.mark.asyncio
     async def test_video_analyzer_output_formatting(self):